@@ -5,3 +5,7 @@ load_dotenv()
 
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "ecommerce")
+
+# Serve price-range product listings from an in-process index
+PRICE_INDEX_ENABLED = os.getenv("PRICE_INDEX_ENABLED", "false").lower() == "true"
+PRICE_INDEX_REFRESH_SECONDS = int(os.getenv("PRICE_INDEX_REFRESH_SECONDS", "300"))
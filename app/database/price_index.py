@@ -0,0 +1,206 @@
+import asyncio
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from bson import ObjectId
+
+from app.config import PRICE_INDEX_ENABLED, PRICE_INDEX_REFRESH_SECONDS
+
+EPOCH = datetime(1970, 1, 1)
+
+# MongoDB sorts a missing created_at below every date
+MISSING_CREATED = int(np.iinfo(np.int64).min)
+
+class PriceIndex:
+    """In-process index of the product catalog ordered by recency.
+
+    Rows are kept as NumPy columns of price, created_at and _id (split into
+    its first 8 and last 4 bytes) sorted by (created_at, _id), the same key
+    the MongoDB listing sorts on, so a price-filtered page is the first
+    matches of a vectorized price mask scanned from the newest row. Only the
+    keys needed to pick a page are held here; the page itself is hydrated
+    from MongoDB.
+
+    Only writes made through this process are applied as they happen.
+    Anything else is picked up by the next rebuild.
+    """
+
+    # Rows masked per step, so shallow pages stop early on large catalogs
+    CHUNK_SIZE = 65536
+
+    def __init__(self):
+        self.prices = np.empty(0, dtype=np.float64)
+        self.created = np.empty(0, dtype=np.int64)
+        self.id_high = np.empty(0, dtype=np.uint64)
+        self.id_low = np.empty(0, dtype=np.uint32)
+        self.size = 0
+        self.ready = False
+        self.building = False
+        self.pending = []
+        self.refresh_requested = asyncio.Event()
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _created_key(product):
+        # Milliseconds since the epoch, the precision MongoDB stores dates at
+        created_at = product.get("created_at")
+        if created_at is None:
+            return MISSING_CREATED
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return (created_at - EPOCH) // timedelta(milliseconds=1)
+
+    @staticmethod
+    def _id_key(product_id):
+        binary = product_id.binary
+        return int.from_bytes(binary[:8], "big"), int.from_bytes(binary[8:], "big")
+
+    @staticmethod
+    def _sort_rows(prices, created, id_high, id_low):
+        # Runs in a worker thread, so it must not touch the live columns
+        prices = np.frombuffer(prices, dtype=np.float64)
+        created = np.frombuffer(created, dtype=np.int64)
+        id_high = np.frombuffer(id_high, dtype=np.uint64)
+        id_low = np.frombuffer(id_low, dtype=np.uint32)
+        order = np.lexsort((id_low, id_high, created))
+        return prices[order], created[order], id_high[order], id_low[order]
+
+    async def build(self, collection):
+        """Load every product from the collection and sort by recency"""
+        self.building = True
+        self.pending = []
+        prices, created = array("d"), array("q")
+        id_high, id_low = array("Q"), array("I")
+        try:
+            async for product in collection.find({}, {"price": 1, "created_at": 1}):
+                high, low = self._id_key(product["_id"])
+                prices.append(float(product["price"]))
+                created.append(self._created_key(product))
+                id_high.append(high)
+                id_low.append(low)
+
+            columns = await asyncio.to_thread(self._sort_rows, prices, created, id_high, id_low)
+        except BaseException:
+            self.building = False
+            self.pending = []
+            raise
+
+        self.prices, self.created, self.id_high, self.id_low = columns
+        self.size = len(self.prices)
+        self.ready = True
+        self.building = False
+
+        # Products created while the collection was being read may be missing
+        pending, self.pending = self.pending, []
+        for product in pending:
+            self._insert(product)
+
+    def add(self, product):
+        """Insert a single product, keeping the recency order.
+
+        Does nothing until a build has started, so a disabled index stays empty.
+        """
+        if self.building:
+            self.pending.append(product)
+        if self.building or self.ready:
+            self._insert(product)
+
+    def request_refresh(self):
+        """Ask the background task to rebuild the index now"""
+        self.refresh_requested.set()
+
+    def _insert(self, product):
+        created = self._created_key(product)
+        high, low = self._id_key(product["_id"])
+        high, low = np.uint64(high), np.uint32(low)
+
+        # Narrow down by created_at, then by each half of the id
+        lo = int(np.searchsorted(self.created[:self.size], created, side="left"))
+        hi = int(np.searchsorted(self.created[:self.size], created, side="right"))
+        lo, hi = (
+            lo + int(np.searchsorted(self.id_high[lo:hi], high, side="left")),
+            lo + int(np.searchsorted(self.id_high[lo:hi], high, side="right")),
+        )
+        position = lo + int(np.searchsorted(self.id_low[lo:hi], low, side="left"))
+        if position < hi and self.id_low[position] == low:
+            return
+
+        if self.size == len(self.prices):
+            capacity = max(16, 2 * self.size)
+            self.prices = np.resize(self.prices, capacity)
+            self.created = np.resize(self.created, capacity)
+            self.id_high = np.resize(self.id_high, capacity)
+            self.id_low = np.resize(self.id_low, capacity)
+
+        # New products are the newest, so these shifts are usually empty
+        for column, value in (
+            (self.prices, float(product["price"])),
+            (self.created, created),
+            (self.id_high, high),
+            (self.id_low, low),
+        ):
+            column[position + 1:self.size + 1] = column[position:self.size]
+            column[position] = value
+        self.size += 1
+
+    def query(self, min_price=None, max_price=None, limit=10, offset=0):
+        """Return product ids in the price range, newest first"""
+        positions = []
+        skip = offset
+        end = self.size
+        while end > 0 and len(positions) < limit:
+            start = max(0, end - self.CHUNK_SIZE)
+            prices = self.prices[start:end]
+            mask = np.ones(len(prices), dtype=bool)
+            if min_price is not None:
+                mask &= prices >= min_price
+            if max_price is not None:
+                mask &= prices <= max_price
+
+            matches = np.flatnonzero(mask)[::-1] + start
+            if skip >= len(matches):
+                skip -= len(matches)
+            else:
+                positions.extend(matches[skip:skip + limit - len(positions)].tolist())
+                skip = 0
+            end = start
+
+        return [
+            ObjectId(int(high).to_bytes(8, "big") + int(low).to_bytes(4, "big"))
+            for high, low in zip(self.id_high[positions], self.id_low[positions])
+        ]
+
+price_index = PriceIndex()
+
+async def refresh_price_index(db):
+    """Build the price index, then rebuild it periodically or on request"""
+    while True:
+        price_index.refresh_requested.clear()
+        try:
+            await price_index.build(db.products)
+            print(f"Price index built with {len(price_index)} products")
+        except Exception as e:
+            print(f"Failed to build price index: {e}")
+
+        try:
+            await asyncio.wait_for(
+                price_index.refresh_requested.wait(),
+                timeout=PRICE_INDEX_REFRESH_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+
+def start_price_index(db):
+    """Start building the price index in the background when it is enabled"""
+    if PRICE_INDEX_ENABLED:
+        return asyncio.create_task(refresh_price_index(db))
+    return None
+
+async def get_price_index():
+    return price_index if price_index.ready else None
+
+async def get_price_index_for_writes():
+    return price_index
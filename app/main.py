@@ -1,16 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 
-from app.database.connection import connect_to_mongo, close_mongo_connection
+from app.database.connection import connect_to_mongo, close_mongo_connection, get_database
+from app.database.price_index import start_price_index
 from app.routers import products, orders
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    price_index_task = start_price_index(await get_database())
     yield
     # Shutdown
+    if price_index_task:
+        price_index_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await price_index_task
     await close_mongo_connection()
 
 app = FastAPI(
@@ -2,8 +2,10 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from datetime import datetime
 
 from app.database.connection import get_database
+from app.database.price_index import PriceIndex, get_price_index, get_price_index_for_writes
 from app.models.product import ProductCreate, ProductResponse
 
 router = APIRouter(prefix="/products", tags=["products"])
@@ -11,11 +13,13 @@ router = APIRouter(prefix="/products", tags=["products"])
 @router.post("/", status_code=201, response_model=ProductResponse)
 async def create_product(
     product: ProductCreate,
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    price_index: PriceIndex = Depends(get_price_index_for_writes)
 ):
     """Create a new product"""
     try:
         product_dict = product.dict()
+        product_dict["created_at"] = datetime.utcnow()
         
         # Check if product with same name already exists
         existing_product = await db.products.find_one({"name": product.name})
@@ -28,6 +32,9 @@ async def create_product(
         result = await db.products.insert_one(product_dict)
         created_product = await db.products.find_one({"_id": result.inserted_id})
         
+        # Also covers an index that is still being built
+        price_index.add(created_product)
+        
         return ProductResponse(
             id=str(created_product["_id"]),
             name=created_product["name"],
@@ -46,7 +53,8 @@ async def list_products(
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
     limit: Optional[int] = Query(10, ge=1, le=100, description="Number of products to return"),
     offset: Optional[int] = Query(0, ge=0, description="Number of products to skip"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    price_index: Optional[PriceIndex] = Depends(get_price_index)
 ):
     """List products with optional filtering and pagination"""
     try:
@@ -65,9 +73,22 @@ async def list_products(
                 price_query["$lte"] = max_price
             query["price"] = price_query
         
-        # Execute query with pagination
-        cursor = db.products.find(query).skip(offset).limit(limit).sort("created_at", -1)
-        products = await cursor.to_list(length=limit)
+        products = None
+        if price_index is not None and not name and "price" in query:
+            # Pick the page from the in-memory index, then fetch it in one batch
+            product_ids = price_index.query(min_price, max_price, limit, offset)
+            cursor = db.products.find({"_id": {"$in": product_ids}})
+            found = {product["_id"]: product async for product in cursor}
+            if len(found) == len(product_ids):
+                products = [found[product_id] for product_id in product_ids]
+            else:
+                # The index lists deleted products, so it is stale
+                price_index.request_refresh()
+        
+        if products is None:
+            # Execute query with pagination
+            cursor = db.products.find(query).skip(offset).limit(limit).sort([("created_at", -1), ("_id", -1)])
+            products = await cursor.to_list(length=limit)
         
         # Transform to response format
         products_response = []
@@ -0,0 +1,93 @@
+"""
+Script to benchmark price-range listings: MongoDB query vs in-memory price index
+Seeds a separate collection, so the real products collection is left untouched
+"""
+import asyncio
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.connection import connect_to_mongo, close_mongo_connection, get_database
+from app.database.price_index import PriceIndex
+
+PRODUCT_COUNT = int(os.getenv("BENCHMARK_PRODUCTS", "1000000"))
+BATCH_SIZE = 10000
+QUERY_COUNT = 50
+
+async def seed_collection(collection):
+    """Fill the benchmark collection with random products"""
+    await collection.drop()
+    start_time = datetime.utcnow() - timedelta(days=365)
+    for batch_start in range(0, PRODUCT_COUNT, BATCH_SIZE):
+        batch = [
+            {
+                "name": f"Product {i}",
+                "price": round(random.uniform(1, 2000), 2),
+                "quantity": random.randint(0, 100),
+                "created_at": start_time + timedelta(seconds=random.randint(0, 365 * 86400))
+            }
+            for i in range(batch_start, min(batch_start + BATCH_SIZE, PRODUCT_COUNT))
+        ]
+        await collection.insert_many(batch)
+    await collection.create_index("price")
+    await collection.create_index("created_at")
+    print(f"Inserted {PRODUCT_COUNT} products")
+
+def random_queries():
+    queries = []
+    for _ in range(QUERY_COUNT):
+        min_price = round(random.uniform(1, 1500), 2)
+        max_price = round(min_price + random.uniform(10, 500), 2)
+        offset = random.choice([0, 0, 10, 50])
+        queries.append((min_price, max_price, 10, offset))
+    return queries
+
+async def mongo_path(collection, min_price, max_price, limit, offset):
+    query = {"price": {"$gte": min_price, "$lte": max_price}}
+    cursor = collection.find(query).skip(offset).limit(limit).sort([("created_at", -1), ("_id", -1)])
+    return await cursor.to_list(length=limit)
+
+async def index_path(collection, index, min_price, max_price, limit, offset):
+    product_ids = index.query(min_price, max_price, limit, offset)
+    cursor = collection.find({"_id": {"$in": product_ids}})
+    found = {product["_id"]: product async for product in cursor}
+    return [found[product_id] for product_id in product_ids if product_id in found]
+
+async def run_benchmark():
+    """Time both listing paths against the same queries"""
+    await connect_to_mongo()
+    db = await get_database()
+    collection = db.products_benchmark
+
+    await seed_collection(collection)
+
+    index = PriceIndex()
+    started = time.perf_counter()
+    await index.build(collection)
+    print(f"Built price index in {time.perf_counter() - started:.2f}s")
+
+    queries = random_queries()
+
+    started = time.perf_counter()
+    for query in queries:
+        await mongo_path(collection, *query)
+    mongo_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for query in queries:
+        await index_path(collection, index, *query)
+    index_elapsed = time.perf_counter() - started
+
+    print(f"MongoDB path:     {mongo_elapsed / QUERY_COUNT * 1000:.1f} ms/query")
+    print(f"Price index path: {index_elapsed / QUERY_COUNT * 1000:.1f} ms/query")
+
+    await collection.drop()
+    await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -5,6 +5,7 @@ Run this after setting up your MongoDB connection
 import asyncio
 import sys
 import os
+from datetime import datetime
 
 # Add the parent directory to the path so we can import our app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -45,6 +46,9 @@ async def seed_products():
         }
     ]
     
+    for product in sample_products:
+        product["created_at"] = datetime.utcnow()
+    
     # Clear existing products (optional)
     await db.products.delete_many({})
     print("Cleared existing products")
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.database.price_index import PriceIndex
+
+BASE_TIME = datetime(2024, 1, 1)
+
+class FakeCollection:
+    def __init__(self, products):
+        self.products = products
+
+    def find(self, *args):
+        async def cursor():
+            for product in self.products:
+                yield product
+        return cursor()
+
+def make_product(price, minutes, product_id=None):
+    return {
+        "_id": product_id or ObjectId(),
+        "price": price,
+        "created_at": BASE_TIME + timedelta(minutes=minutes)
+    }
+
+def make_index(products):
+    index = PriceIndex()
+    asyncio.run(index.build(FakeCollection([])))
+    for product in products:
+        index.add(product)
+    return index
+
+def expected_ids(products, min_price=None, max_price=None, limit=10, offset=0):
+    matches = [
+        product for product in products
+        if (min_price is None or product["price"] >= min_price)
+        and (max_price is None or product["price"] <= max_price)
+    ]
+    matches.sort(key=lambda product: (product["created_at"], product["_id"]), reverse=True)
+    return [product["_id"] for product in matches[offset:offset + limit]]
+
+PRODUCTS = [
+    make_product(10.0, 1),
+    make_product(20.0, 2),
+    make_product(20.0, 3),
+    make_product(30.0, 4),
+    make_product(40.0, 5),
+    make_product(20.0, 6),
+    make_product(50.0, 7),
+]
+
+def test_min_price_only():
+    index = make_index(PRODUCTS)
+    assert index.query(min_price=30.0) == expected_ids(PRODUCTS, min_price=30.0)
+
+def test_max_price_only():
+    index = make_index(PRODUCTS)
+    assert index.query(max_price=20.0) == expected_ids(PRODUCTS, max_price=20.0)
+
+def test_empty_range():
+    index = make_index(PRODUCTS)
+    assert index.query(min_price=21.0, max_price=29.0) == []
+    assert index.query(min_price=40.0, max_price=30.0) == []
+    assert PriceIndex().query(min_price=1.0) == []
+
+def test_price_ties_at_range_edges():
+    index = make_index(PRODUCTS)
+    result = index.query(min_price=20.0, max_price=30.0)
+    assert result == expected_ids(PRODUCTS, min_price=20.0, max_price=30.0)
+    assert len(result) == 4
+
+def test_offset_past_end_of_range():
+    index = make_index(PRODUCTS)
+    assert index.query(min_price=20.0, max_price=20.0, limit=10, offset=3) == []
+    assert index.query(min_price=20.0, max_price=20.0, limit=10, offset=2) == [PRODUCTS[1]["_id"]]
+
+def test_pagination_across_chunks():
+    index = make_index(PRODUCTS)
+    index.CHUNK_SIZE = 2
+    for offset in range(len(PRODUCTS) + 1):
+        assert index.query(max_price=40.0, limit=2, offset=offset) == expected_ids(
+            PRODUCTS, max_price=40.0, limit=2, offset=offset
+        )
+
+def test_add_keeps_recency_order():
+    products = [make_product(10.0 * (i % 4 + 1), minutes) for i, minutes in enumerate([5, 1, 9, 3, 7, 3])]
+    index = make_index(products)
+    assert list(index.created[:len(index)]) == sorted(index.created[:len(index)])
+    assert index.query() == expected_ids(products)
+
+def test_add_ignores_duplicate_product():
+    index = make_index(PRODUCTS)
+    index.add(PRODUCTS[2])
+    assert len(index) == len(PRODUCTS)
+
+def test_missing_created_at_sorts_last():
+    undated = {"_id": ObjectId(), "price": 25.0}
+    index = make_index(PRODUCTS + [undated])
+    assert index.query(limit=100)[-1] == undated["_id"]
+
+def test_build_matches_incremental_adds():
+    index = PriceIndex()
+    asyncio.run(index.build(FakeCollection(list(reversed(PRODUCTS)))))
+    assert index.ready
+    assert index.query(limit=100) == make_index(PRODUCTS).query(limit=100)
+
+def test_add_before_build_is_ignored():
+    index = PriceIndex()
+    index.add(PRODUCTS[0])
+    assert len(index) == 0
+
+def test_ids_round_trip():
+    products = [
+        make_product(10.0, 1, ObjectId("ffffffffffffffffffffffff")),
+        make_product(10.0, 1, ObjectId("000000000000000000000000")),
+        make_product(10.0, 1, ObjectId("80000000000000007fffffff")),
+    ]
+    index = make_index(products)
+    assert index.query() == expected_ids(products)
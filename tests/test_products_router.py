@@ -0,0 +1,126 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from mongomock_motor import AsyncMongoMockClient
+
+from app.database.price_index import PriceIndex
+from app.models.product import ProductCreate
+from app.routers.products import create_product, list_products
+
+QUERIES = [
+    (None, 500.0, 10, 0),
+    (100.0, None, 10, 0),
+    (100.0, 300.0, 10, 0),
+    (100.0, 300.0, 25, 40),
+    (250.0, 250.0, 10, 0),
+    (600.0, 700.0, 10, 0),
+    (0.0, 1000.0, 100, 150),
+    (0.0, 1000.0, 10, 1000),
+]
+
+async def seed(db):
+    rng = random.Random(26)
+    base_time = datetime(2024, 1, 1)
+    products = []
+    for i in range(200):
+        product = {
+            "name": f"Product {i}",
+            "price": float(rng.choice([50, 100, 150, 250, 300, 450])),
+            "quantity": rng.randint(0, 20)
+        }
+        # Some products share a created_at, some have none at all
+        if i % 10:
+            product["created_at"] = base_time + timedelta(minutes=rng.randint(0, 50))
+        products.append(product)
+    await db.products.insert_many(products)
+
+async def list_ids(db, price_index, min_price, max_price, limit, offset):
+    products = await list_products(
+        name=None, min_price=min_price, max_price=max_price,
+        limit=limit, offset=offset, db=db, price_index=price_index
+    )
+    return [product.id for product in products]
+
+async def assert_paths_match(db, price_index):
+    for query in QUERIES:
+        from_mongo = await list_ids(db, None, *query)
+        from_index = await list_ids(db, price_index, *query)
+        assert from_index == from_mongo, query
+
+def test_index_path_matches_mongo_path():
+    async def run():
+        db = AsyncMongoMockClient()["test"]
+        await seed(db)
+        price_index = PriceIndex()
+        await price_index.build(db.products)
+
+        await assert_paths_match(db, price_index)
+
+        for i in range(20):
+            product = ProductCreate(name=f"New product {i}", price=250.0, quantity=1)
+            await create_product(product=product, db=db, price_index=price_index)
+        assert len(price_index) == 220
+
+        await assert_paths_match(db, price_index)
+        assert not price_index.refresh_requested.is_set()
+
+    asyncio.run(run())
+
+def test_stale_index_falls_back_to_mongo():
+    async def run():
+        db = AsyncMongoMockClient()["test"]
+        await seed(db)
+        price_index = PriceIndex()
+        await price_index.build(db.products)
+
+        await db.products.delete_many({"price": 250.0})
+        assert not price_index.refresh_requested.is_set()
+
+        from_mongo = await list_ids(db, None, 200.0, 300.0, 10, 0)
+        from_index = await list_ids(db, price_index, 200.0, 300.0, 10, 0)
+        assert from_index == from_mongo
+        assert len(from_index) == 10
+        assert price_index.refresh_requested.is_set()
+
+    asyncio.run(run())
+
+class SuspendedCollection:
+    """Yields a snapshot of the products, pausing halfway until released"""
+
+    def __init__(self, products):
+        self.products = products
+        self.suspended = asyncio.Event()
+        self.release = asyncio.Event()
+
+    def find(self, *args):
+        async def cursor():
+            for i, product in enumerate(self.products):
+                if i == len(self.products) // 2:
+                    self.suspended.set()
+                    await self.release.wait()
+                yield product
+        return cursor()
+
+def test_product_created_during_first_build_is_indexed():
+    async def run():
+        db = AsyncMongoMockClient()["test"]
+        await seed(db)
+        collection = SuspendedCollection(await db.products.find({}).to_list(length=None))
+        price_index = PriceIndex()
+
+        build = asyncio.create_task(price_index.build(collection))
+        await collection.suspended.wait()
+        assert not price_index.ready
+
+        product = ProductCreate(name="Created during build", price=250.0, quantity=1)
+        created = await create_product(product=product, db=db, price_index=price_index)
+
+        collection.release.set()
+        await build
+
+        assert len(price_index) == 201
+        assert (await list_ids(db, price_index, 200.0, 300.0, 1, 0)) == [created.id]
+        await assert_paths_match(db, price_index)
+
+    asyncio.run(run())